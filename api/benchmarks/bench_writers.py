@@ -0,0 +1,154 @@
+"""CSV and HTML writer throughput, before and after the tuple-row writers.
+
+"before" replays the previous implementations: per-row dict generation (one
+random/Faker call and one ensure_unique check per cell), csv.DictWriter over
+dict rows, and HTML built one list element per cell. The HTML "before" case
+escapes every cell so it does the same work as the current writer. "after"
+is the current format_utils writers fed tuple rows straight from
+generate_mock_rows. The "+gen" cases include generation. The schema only
+uses types the per-row generator supported, including Faker-backed ones.
+
+Usage:
+    python benchmarks/bench_writers.py [--rows 100000] [--repeat 3]
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import time
+from html import escape
+
+from faker import Faker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_generator import ensure_unique, generate_mock_rows  # noqa: E402
+from format_utils import convert_rows_to_csv, convert_rows_to_html  # noqa: E402
+
+# Separate from data_generator's instance, as the "before" side shares no state with it
+faker = Faker()
+
+SCHEMA = {
+    "id": {"type": "int", "min": 1, "max": 1000000},
+    "name": {"type": "name"},
+    "email": {"type": "email"},
+    "score": {"type": "float", "min": 0, "max": 100},
+    "day": {"type": "date"},
+    "total": {"type": "price"},
+}
+
+
+def generate_before(schema, count, seed):
+    """Per-row dict generation, the way generate_mock_data worked before tuple rows"""
+    rng = random.Random(seed)
+    faker.seed_instance(seed)
+    unique_fields = {}
+    results = []
+    for _ in range(count):
+        first_name, last_name = "", ""
+        item = {}
+        for field, config in schema.items():
+            field_type = config.get("type", "string")
+            if field_type == "int":
+                min_val, max_val = config.get("min", 0), config.get("max", 100)
+                value = rng.randint(min_val, max_val)
+                item[field] = ensure_unique(field, value, lambda: rng.randint(min_val, max_val), unique_fields)
+            elif field_type == "float":
+                min_val, max_val = config.get("min", 0), config.get("max", 100)
+                value = round(rng.uniform(min_val, max_val), 2)
+                item[field] = ensure_unique(field, value, lambda: round(rng.uniform(min_val, max_val), 2),
+                                            unique_fields)
+            elif field_type == "price":
+                value = round(rng.uniform(1.0, 1000.0), 2)
+                item[field] = ensure_unique(field, value, lambda: round(rng.uniform(1.0, 1000.0), 2), unique_fields)
+            elif field_type == "date":
+                item[field] = ensure_unique(field, faker.date(), faker.date, unique_fields)
+            elif field_type == "email":
+                item[field] = ensure_unique(field, faker.email(), faker.email, unique_fields)
+            elif field_type == "name":
+                if not first_name:
+                    first_name = ensure_unique(field, faker.first_name(), faker.first_name, unique_fields)
+                if not last_name:
+                    last_name = ensure_unique(field, faker.last_name(), faker.last_name, unique_fields)
+                item[field] = f"{first_name} {last_name}"
+            else:
+                raise ValueError(f"generate_before doesn't support {field_type}")
+        results.append(item)
+    return results
+
+
+def csv_before(data):
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=data[0].keys())
+    writer.writeheader()
+    writer.writerows(data)
+    return output.getvalue()
+
+
+def html_before(data):
+    html = ["<html>", "<body>", "<table border='1'>", "<thead>", "<tr>"]
+    for key in data[0].keys():
+        html.append(f"<th>{escape(key)}</th>")
+    html.extend(["</tr>", "</thead>", "<tbody>"])
+    for item in data:
+        html.append("<tr>")
+        for value in item.values():
+            html.append(f"<td>{escape(str(value))}</td>")
+        html.append("</tr>")
+    html.extend(["</tbody>", "</table>", "</body>", "</html>"])
+    return "\n".join(html)
+
+
+def csv_pipeline_before(count):
+    return csv_before(generate_before(SCHEMA, count, seed=1))
+
+
+def csv_pipeline_after(count):
+    return convert_rows_to_csv(*generate_mock_rows(SCHEMA, count, seed=1))
+
+
+def html_pipeline_before(count):
+    return html_before(generate_before(SCHEMA, count, seed=1))
+
+
+def html_pipeline_after(count):
+    return convert_rows_to_html(*generate_mock_rows(SCHEMA, count, seed=1))
+
+
+def best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    columns, rows = generate_mock_rows(SCHEMA, args.rows, seed=1)
+    dicts = [dict(zip(columns, row)) for row in rows]
+
+    cases = [
+        ("csv", best_of(args.repeat, csv_before, dicts), best_of(args.repeat, convert_rows_to_csv, columns, rows)),
+        ("html", best_of(args.repeat, html_before, dicts), best_of(args.repeat, convert_rows_to_html, columns, rows)),
+        ("csv+gen", best_of(args.repeat, csv_pipeline_before, args.rows),
+         best_of(args.repeat, csv_pipeline_after, args.rows)),
+        ("html+gen", best_of(args.repeat, html_pipeline_before, args.rows),
+         best_of(args.repeat, html_pipeline_after, args.rows)),
+    ]
+    print(f"{args.rows} rows, best of {args.repeat}")
+    print(f"{'case':<10}{'before rows/s':>16}{'after rows/s':>16}{'speedup':>10}")
+    for name, before, after in cases:
+        print(f"{name:<10}{args.rows / before:>16,.0f}{args.rows / after:>16,.0f}{before / after:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,28 @@
 from faker import Faker
+from datetime import date, timedelta
+import ast
+import itertools
+import math
 import random
+import threading
 import rstr
 
 faker = Faker()
 
+NUMERIC_DEFAULTS = {
+    "int": (0, 100),
+    "float": (0, 100),
+    "price": (1.0, 1000.0),
+}
+
+DISTRIBUTIONS = ("uniform", "normal", "exponential", "zipf", "poisson")
+
+
+def seed_generators(seed=None):
+    """Seed the random sources behind every field type (None reseeds from OS entropy)"""
+    random.seed(seed)
+    faker.seed_instance(seed)
+
 def ensure_unique(field, value, generator_func, unique_fields, max_retries=100):
     """Uniqueness checking with retry limit"""
     if field not in unique_fields:
@@ -26,190 +45,578 @@ def ensure_unique(field, value, generator_func, unique_fields, max_retries=100):
     unique_fields[field].add(value)
     return value
 
-def generate_unique_values(field_type, config, count, unique_fields):
-    """Pre-generate unique values for better performance"""
+def unique_column(field, column, resample, seen, max_retries=100):
+    """Redraw repeated values in a sampled column until every value is new.
+
+    Unlike ensure_unique this never rewrites a value, so each one stays valid
+    for its field; raises ValueError when max_retries draws turn up nothing new.
+    """
+    unique_values = []
+    for value in column:
+        retries = 0
+        while value in seen:
+            if retries == max_retries:
+                raise ValueError(f"Cannot generate {len(column)} unique values for {field}")
+            value = resample()
+            retries += 1
+        seen.add(value)
+        unique_values.append(value)
+    return unique_values
+
+def generate_unique_values(field_type, config, count, unique_fields, rng=random, fake=faker):
+    """Pre-generate unique values for better performance.
+
+    Values already in unique_fields[field] (from earlier batches) are never
+    repeated, and the new values are added to it.
+    """
     if not config.get("unique"):
         return None
     
     field_name = config.get("field_name", "unknown")
-    unique_values = set()
+    seen = unique_fields.setdefault(field_name, set())
+    unique_values = []
     
-    if field_type == "int":
+    if field_type == "int" and config.get("distribution", "uniform") == "uniform":
         min_val = config.get("min", 0)
         max_val = config.get("max", 100)
-        capacity = max_val - min_val + 1
+        remaining = max_val - min_val + 1 - len(seen)
         
-        if count > capacity:
-            # If we need more values than possible, use the full range
-            values = list(range(min_val, max_val + 1))
-            random.shuffle(values)
-            return values[:count]
+        if count > remaining:
+            raise ValueError(f"Cannot generate {count} unique values for {field_name}: "
+                             f"only {max(remaining, 0)} left between {min_val} and {max_val}")
+        elif count * 2 > remaining:
+            # Dense: shuffle what is left of the range
+            values = [v for v in range(min_val, max_val + 1) if v not in seen]
+            rng.shuffle(values)
+            unique_values = values[:count]
         else:
-            # Generate random unique integers
+            # Sparse: draw random integers until enough new ones
             while len(unique_values) < count:
-                unique_values.add(random.randint(min_val, max_val))
-            return list(unique_values)
-    
-    elif field_type == "email":
-        while len(unique_values) < count:
-            unique_values.add(faker.email())
-        return list(unique_values)
-    
-    elif field_type == "uuid":
-        while len(unique_values) < count:
-            unique_values.add(faker.uuid4())
-        return list(unique_values)
-    
-    elif field_type == "username":
-        while len(unique_values) < count:
-            unique_values.add(faker.user_name())
-        return list(unique_values)
-    
-    elif field_type == "ip":
-        while len(unique_values) < count:
-            unique_values.add(faker.ipv4())
-        return list(unique_values)
+                value = rng.randint(min_val, max_val)
+                if value not in seen:
+                    seen.add(value)
+                    unique_values.append(value)
+        seen.update(unique_values)
+        return unique_values
     
+    generators = {
+        "email": fake.email,
+        "uuid": fake.uuid4,
+        "username": fake.user_name,
+        "ip": fake.ipv4,
+    }
+    if field_type not in generators:
+        return None
+
+    generate = generators[field_type]
+    # A list keeps the order reproducible under a seed; sets of strings aren't
+    while len(unique_values) < count:
+        value = generate()
+        if value not in seen:
+            seen.add(value)
+            unique_values.append(value)
+    return unique_values
+
+
+# zipf/poisson ranges up to this many integers are sampled from a cached table
+# of cumulative weights; wider ranges draw each value directly
+WEIGHT_TABLE_LIMIT = 10000
+# Total entries kept across all cached tables
+CUM_WEIGHTS_CACHE_LIMIT = 100000
+
+
+def _discrete_cum_weights(distribution, min_val, max_val, exponent, mean):
+    """Cumulative weights over the integers min_val..max_val"""
+    if distribution == "zipf":
+        weights = (1.0 / (rank ** exponent) for rank in range(1, max_val - min_val + 2))
+    else:
+        # Poisson pmf in log space, truncated to [min, max]; stays finite for large means
+        log_mean = math.log(mean) if mean > 0 else float("-inf")
+        weights = (
+            math.exp(k * log_mean - mean - math.lgamma(k + 1)) if k > 0 else math.exp(-mean) if k == 0 else 0.0
+            for k in range(min_val, max_val + 1)
+        )
+    cum_weights = list(itertools.accumulate(weights))
+    if not cum_weights or cum_weights[-1] <= 0:
+        raise ValueError(f"{distribution} distribution has no mass between {min_val} and {max_val}")
+    return cum_weights
+
+
+_cum_weights_cache = {}
+_cum_weights_cached = 0
+_cum_weights_lock = threading.Lock()
+
+
+def _cached_cum_weights(distribution, min_val, max_val, exponent, mean):
+    global _cum_weights_cached
+    key = (distribution, min_val, max_val, exponent, mean)
+    cum_weights = _cum_weights_cache.get(key)
+    if cum_weights is None:
+        cum_weights = _discrete_cum_weights(*key)
+        with _cum_weights_lock:
+            if key not in _cum_weights_cache:
+                # Evict the oldest tables until the new one fits
+                while _cum_weights_cache and _cum_weights_cached + len(cum_weights) > CUM_WEIGHTS_CACHE_LIMIT:
+                    _cum_weights_cached -= len(_cum_weights_cache.pop(next(iter(_cum_weights_cache))))
+                _cum_weights_cache[key] = cum_weights
+                _cum_weights_cached += len(cum_weights)
+    return cum_weights
+
+
+def _expm1_over(x):
+    """expm1(x) / x, accurate near 0"""
+    return math.expm1(x) / x if abs(x) > 1e-8 else 1 + x * 0.5 * (1 + x / 3 * (1 + 0.25 * x))
+
+
+def _log1p_over(x):
+    """log1p(x) / x, accurate near 0"""
+    return math.log1p(x) / x if abs(x) > 1e-8 else 1 - x * (0.5 - x * (1 / 3 - 0.25 * x))
+
+
+def _zipf_ranks(n, exponent, count, rand):
+    """count Zipf ranks in 1..n by rejection-inversion (Hörmann & Derflinger, 1996).
+
+    Expected O(1) per draw and no table, whatever the size of n.
+    """
+    def h(x):
+        return math.exp(-exponent * math.log(x))
+
+    def h_integral(x):
+        log_x = math.log(x)
+        return _expm1_over((1 - exponent) * log_x) * log_x
+
+    def h_integral_inverse(x):
+        t = x * (1 - exponent)
+        if t <= -1:
+            return math.inf
+        return math.exp(_log1p_over(t) * x)
+
+    h_integral_first = h_integral(1.5) - 1
+    h_integral_last = h_integral(n + 0.5)
+    squeeze = 2 - h_integral_inverse(h_integral(2.5) - h(2))
+
+    ranks = []
+    while len(ranks) < count:
+        u = h_integral_last + rand() * (h_integral_first - h_integral_last)
+        x = h_integral_inverse(u)
+        k = max(int(min(x + 0.5, n)), 1)
+        if k - x <= squeeze or u >= h_integral(k + 0.5) - h(k):
+            ranks.append(k)
+    return ranks
+
+
+def _poisson_variate(mean, rand):
+    """One Poisson variate: inversion for small means, PTRS (Hörmann, 1993) above"""
+    if mean < 10:
+        k, p = 0, math.exp(-mean)
+        cdf, u = p, rand()
+        while u > cdf and p:
+            k += 1
+            p *= mean / k
+            cdf += p
+        return k
+
+    sqrt_mean, log_mean = math.sqrt(mean), math.log(mean)
+    b = 0.931 + 2.53 * sqrt_mean
+    a = -0.059 + 0.02483 * b
+    log_inv_alpha = math.log(1.1239 + 1.1328 / (b - 3.4))
+    v_r = 0.9277 - 3.6224 / (b - 2)
+    while True:
+        u = rand() - 0.5
+        v = rand()
+        us = 0.5 - abs(u)
+        k = math.floor((2 * a / us + b) * u + mean + 0.43)
+        if us >= 0.07 and v <= v_r:
+            return k
+        if k < 0 or (us < 0.013 and v > us):
+            continue
+        if math.log(v) + log_inv_alpha - math.log(a / (us * us) + b) <= -mean + k * log_mean - math.lgamma(k + 1):
+            return k
+
+
+def _truncated_poisson(mean, min_val, max_val, count, rand):
+    """count Poisson variates conditioned on min_val..max_val, by rejection"""
+    values = []
+    attempts_left = 1000 + 100 * count
+    while len(values) < count:
+        if not attempts_left:
+            raise ValueError(f"poisson distribution with mean {mean} has almost no mass "
+                             f"between {min_val} and {max_val}")
+        attempts_left -= 1
+        k = _poisson_variate(mean, rand)
+        if min_val <= k <= max_val:
+            values.append(k)
+    return values
+
+
+def sample_numeric(field_type, config, count, rng=random):
+    """Sample a whole int/float/price column from the configured distribution"""
+    default_min, default_max = NUMERIC_DEFAULTS[field_type]
+    min_val = config.get("min", default_min)
+    max_val = config.get("max", default_max)
+    distribution = config.get("distribution", "uniform")
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unsupported distribution: {distribution}")
+    if min_val > max_val:
+        raise ValueError("min cannot be greater than max")
+    is_int = field_type == "int"
+
+    if distribution in ("zipf", "poisson"):
+        if not is_int:
+            raise ValueError(f"{distribution} distribution applies to int fields only")
+        exponent = float(config.get("exponent", 1.1))
+        mean = float(config.get("mean", (min_val + max_val) / 2))
+        if distribution == "zipf" and exponent <= 0:
+            raise ValueError("zipf exponent must be positive")
+        if distribution == "poisson" and mean < 0:
+            raise ValueError("poisson mean cannot be negative")
+        if max_val - min_val < WEIGHT_TABLE_LIMIT:
+            cum_weights = _cached_cum_weights(distribution, min_val, max_val, exponent, mean)
+            return rng.choices(range(min_val, max_val + 1), cum_weights=cum_weights, k=count)
+        if distribution == "zipf":
+            return [min_val + rank - 1 for rank in _zipf_ranks(max_val - min_val + 1, exponent, count, rng.random)]
+        return _truncated_poisson(mean, min_val, max_val, count, rng.random)
+
+    if distribution == "uniform":
+        if is_int:
+            return rng.choices(range(min_val, max_val + 1), k=count)
+        span = max_val - min_val
+        rand = rng.random
+        return [round(min_val + span * rand(), 2) for _ in range(count)]
+
+    if distribution == "normal":
+        mean = config.get("mean", (min_val + max_val) / 2)
+        std = config.get("std", (max_val - min_val) / 6 or 1)
+        gauss = rng.gauss
+        raw = [gauss(mean, std) for _ in range(count)]
+    else:
+        # exponential: offset from min, "mean" is the expected value
+        mean = config.get("mean", min_val + (max_val - min_val) / 4)
+        scale = mean - min_val
+        if scale <= 0:
+            raise ValueError("exponential mean must be greater than min")
+        expo = rng.expovariate
+        rate = 1.0 / scale
+        raw = [min_val + expo(rate) for _ in range(count)]
+
+    if is_int:
+        return [min(max(round(v), min_val), max_val) for v in raw]
+    return [round(min(max(v, min_val), max_val), 2) for v in raw]
+
+
+def sample_enum(config, count, rng=random):
+    """Sample a categorical column, optionally weighted"""
+    values = config.get("values")
+    if not isinstance(values, list) or not values:
+        raise ValueError("enum requires a non-empty 'values' list")
+    weights = config.get("weights")
+    if weights is not None:
+        if not isinstance(weights, list) or len(weights) != len(values):
+            raise ValueError("enum 'weights' must be a list matching 'values' in length")
+        if not all(isinstance(w, (int, float)) and not isinstance(w, bool) and 0 <= w < math.inf for w in weights):
+            raise ValueError("enum 'weights' must be non-negative numbers")
+        if not sum(weights) > 0:
+            raise ValueError("enum 'weights' must have a positive sum")
+    return rng.choices(values, weights=weights, k=count)
+
+
+def sample_date(config, count, rng=random):
+    """Sample ISO dates uniformly between 'start' and 'end' (default 1970-01-01..today)"""
+    start = date.fromisoformat(config.get("start", "1970-01-01")).toordinal()
+    end = date.fromisoformat(config["end"]).toordinal() if "end" in config else date.today().toordinal()
+    if start > end:
+        raise ValueError("start cannot be after end")
+    from_ordinal = date.fromordinal
+    return [from_ordinal(o).isoformat() for o in rng.choices(range(start, end + 1), k=count)]
+
+
+def sample_column(field_type, config, count, rng=random):
+    """Batch-sample a column for the vectorizable types; None for the rest"""
+    if field_type in NUMERIC_DEFAULTS:
+        return sample_numeric(field_type, config, count, rng)
+    if field_type == "enum":
+        return sample_enum(config, count, rng)
+    if field_type == "date":
+        return sample_date(config, count, rng)
     return None
 
-def generate_mock_data(schema: dict, count: int = 10):
-    """Generate raw mock data as list[dict]. No formatting."""
+
+# Field types a derived expression may reference
+NUMERIC_TYPES = ("int", "float", "price", "derived")
+
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_DERIVED_FUNCS = {"round": round, "min": min, "max": max, "abs": abs}
+MAX_EXPONENT = 64
+
+
+def _checked_pow(base, exponent):
+    """** for derived expressions, refusing results too large to compute cheaply"""
+    if abs(exponent) > MAX_EXPONENT:
+        raise ValueError(f"Exponent {exponent} exceeds the limit of {MAX_EXPONENT}")
+    if base and exponent > 0 and exponent * math.log10(abs(base)) > 308:
+        raise ValueError("Result of ** is too large")
+    return base ** exponent
+
+
+class _PowToCall(ast.NodeTransformer):
+    # Expressions may not reference dunder names, so __pow can't be shadowed
+    def visit_BinOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return ast.Call(func=ast.Name(id="__pow", ctx=ast.Load()), args=[node.left, node.right], keywords=[])
+        return node
+
+
+def compile_expression(expression, field_types):
+    """Compile a derived-column expression into (function, referenced fields).
+
+    field_types maps the fields available so far to their types. Only
+    arithmetic, numeric literals, numeric fields and round/min/max/abs are
+    allowed; anything else raises ValueError.
+    """
+    tree = ast.parse(expression, mode="eval")
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if node.id in _DERIVED_FUNCS:
+                continue
+            if node.id.startswith("__"):
+                raise ValueError(f"Unsupported name in expression: {node.id}")
+            if node.id not in field_types:
+                raise ValueError(f"Unknown field in expression: {node.id}")
+            if field_types[node.id] not in NUMERIC_TYPES:
+                raise ValueError(f"Field {node.id} is not numeric and can't be used in an expression")
+            if node.id not in names:
+                names.append(node.id)
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in _DERIVED_FUNCS or node.keywords:
+                raise ValueError("Only round, min, max and abs calls are allowed")
+        elif isinstance(node, ast.BinOp):
+            if not isinstance(node.op, _BIN_OPS):
+                raise ValueError("Unsupported operator in expression")
+        elif isinstance(node, ast.UnaryOp):
+            if not isinstance(node.op, (ast.USub, ast.UAdd)):
+                raise ValueError("Unsupported operator in expression")
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+                raise ValueError("Only numeric literals are allowed in expressions")
+        elif not isinstance(node, (ast.Expression, ast.Load, ast.operator, ast.unaryop)):
+            raise ValueError(f"Unsupported syntax in expression: {type(node).__name__}")
+
+    # Field names are passed positionally so the column can be evaluated with map()
+    func_node = ast.Expression(ast.Lambda(
+        args=ast.arguments(posonlyargs=[], args=[ast.arg(arg=n) for n in names],
+                           kwonlyargs=[], kw_defaults=[], defaults=[]),
+        body=_PowToCall().visit(tree.body),
+    ))
+    ast.fix_missing_locations(func_node)
+    func = eval(compile(func_node, "<derived>", "eval"),
+                {"__builtins__": {}, "__pow": _checked_pow, **_DERIVED_FUNCS})
+    return func, names
+
+
+def derive_column(field, config, columns, field_types):
+    """Evaluate a derived column from already generated columns"""
+    expression = config.get("expression")
+    if not isinstance(expression, str) or not expression.strip():
+        raise ValueError(f"derived field {field} requires an 'expression'")
+    func, names = compile_expression(expression, {name: field_types[name] for name in columns})
+    digits = config.get("round")
+    try:
+        if names:
+            values = list(map(func, *(columns[n] for n in names)))
+        else:
+            count = len(next(iter(columns.values()))) if columns else 0
+            values = [func()] * count
+        if digits is not None:
+            values = [round(v, digits) for v in values]
+        # inf and nan aren't valid JSON numbers
+        if any(isinstance(v, float) and not math.isfinite(v) for v in values):
+            raise ValueError("result is not a finite number")
+    except (ArithmeticError, TypeError, ValueError) as e:
+        raise ValueError(f"Cannot evaluate expression for {field}: {e}") from None
+    return values
+
+
+def generate_mock_data(schema: dict, count: int = 10, seed=None):
+    """Generate raw mock data as list[dict]. No formatting.
+
+    With a seed the output is reproducible for the same schema and count.
+    """
+    columns, rows = generate_mock_rows(schema, count, seed)
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def generate_mock_rows(schema: dict, count: int = 10, seed=None, unique_state=None):
+    """Generate raw mock data as (columns, list[tuple]) in schema field order.
+
+    Cheaper than generate_mock_data for tabular writers that never need dicts.
+    Passing the same unique_state dict to successive calls keeps unique fields
+    unique across all of them (used for batched generation).
+    """
+    if seed is None:
+        return list(schema), _generate_rows(schema, count, unique_state)
+
+    # Seeded runs get private generators, so they neither disturb the shared
+    # streams nor depend on what other requests draw from them meanwhile
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+    return list(schema), _generate_rows(schema, count, unique_state, rng, fake)
+
+
+def _generate_rows(schema: dict, count: int, unique_fields=None, rng=random, fake=faker):
     results = []
-    unique_fields = {}
+    unique_fields = {} if unique_fields is None else unique_fields
     pre_generated_values = {}
+    derived_fields = []
+    xeger = rstr.xeger if rng is random else rstr.Rstr(rng).xeger
 
     # Pre-generate unique values for better performance
     for field, config in schema.items():
         if config.get("unique"):
             field_type = config.get("type", "string")
             config["field_name"] = field
-            pre_generated = generate_unique_values(field_type, config, count, unique_fields)
+            unique_fields.setdefault(field, set())
+            pre_generated = generate_unique_values(field_type, config, count, unique_fields, rng, fake)
             if pre_generated:
                 pre_generated_values[field] = pre_generated
-            else:
-                unique_fields[field] = set()
+
+    # Batch-sample distribution-backed columns instead of drawing per row
+    for field, config in schema.items():
+        field_type = config.get("type", "string")
+        if field_type == "derived":
+            derived_fields.append(field)
+            continue
+        if field in pre_generated_values:
+            continue
+        column = sample_column(field_type, config, count, rng)
+        if column is None:
+            continue
+        if field in unique_fields:
+            column = unique_column(field, column, lambda: sample_column(field_type, config, 1, rng)[0],
+                                   unique_fields[field])
+        pre_generated_values[field] = column
 
     for i in range(count):
         first_name, last_name = "", ""
-        item = {}
+        row = []
         
         for field, config in schema.items():
             field_type = config.get("type", "string")
 
             # Use pre-generated values if available
             if field in pre_generated_values:
-                item[field] = pre_generated_values[field][i]
+                row.append(pre_generated_values[field][i])
                 continue
 
             if field_type == "string":
                 pattern = config.get("pattern")
                 if pattern:
-                    value = rstr.xeger(pattern)
-                    value = ensure_unique(field, value, lambda: rstr.xeger(pattern), unique_fields)
-                    item[field] = value
+                    value = xeger(pattern)
+                    value = ensure_unique(field, value, lambda: xeger(pattern), unique_fields)
+                    row.append(value)
                 else:
-                    value = faker.word()
-                    value = ensure_unique(field, value, faker.word, unique_fields)
-                    item[field] = value
-            elif field_type == "int":
-                min_val = config.get("min", 0)
-                max_val = config.get("max", 100)
-                value = random.randint(min_val, max_val)
-                value = ensure_unique(field, value, lambda: random.randint(min_val, max_val), unique_fields)
-                item[field] = value
-            elif field_type == "float":
-                min_val = config.get("min", 0)
-                max_val = config.get("max", 100)
-                value = round(random.uniform(min_val, max_val), 2)
-                value = ensure_unique(field, value, lambda: round(random.uniform(min_val, max_val), 2), unique_fields)
-                item[field] = value
+                    value = fake.word()
+                    value = ensure_unique(field, value, fake.word, unique_fields)
+                    row.append(value)
             elif field_type == "bool":
-                value = faker.boolean()
-                value = ensure_unique(field, value, faker.boolean, unique_fields)
-                item[field] = value
-            elif field_type == "date":
-                value = faker.date()
-                value = ensure_unique(field, value, faker.date, unique_fields)
-                item[field] = value
+                value = fake.boolean()
+                value = ensure_unique(field, value, fake.boolean, unique_fields)
+                row.append(value)
             elif field_type == "uuid":
-                value = faker.uuid4()
-                value = ensure_unique(field, value, faker.uuid4, unique_fields)
-                item[field] = value
+                value = fake.uuid4()
+                value = ensure_unique(field, value, fake.uuid4, unique_fields)
+                row.append(value)
             elif field_type == "email":
-                value = faker.email()
-                value = ensure_unique(field, value, faker.email, unique_fields)
-                item[field] = value
+                value = fake.email()
+                value = ensure_unique(field, value, fake.email, unique_fields)
+                row.append(value)
             elif field_type == "name":
                 if not first_name:
-                    first_name = faker.first_name()
-                    first_name = ensure_unique(field, first_name, faker.first_name, unique_fields)
+                    first_name = fake.first_name()
+                    first_name = ensure_unique(field, first_name, fake.first_name, unique_fields)
                 if not last_name:
-                    last_name = faker.last_name()
-                    last_name = ensure_unique(field, last_name, faker.last_name, unique_fields)
-                item[field] = f"{first_name} {last_name}"
+                    last_name = fake.last_name()
+                    last_name = ensure_unique(field, last_name, fake.last_name, unique_fields)
+                row.append(f"{first_name} {last_name}")
             elif field_type == "first_name":
                 if not first_name:
-                    first_name = faker.first_name()
-                    first_name = ensure_unique(field, first_name, faker.first_name, unique_fields)
-                item[field] = first_name
+                    first_name = fake.first_name()
+                    first_name = ensure_unique(field, first_name, fake.first_name, unique_fields)
+                row.append(first_name)
             elif field_type == "last_name":
                 if not last_name:
-                    last_name = faker.last_name()
-                    last_name = ensure_unique(field, last_name, faker.last_name, unique_fields)
-                item[field] = last_name
+                    last_name = fake.last_name()
+                    last_name = ensure_unique(field, last_name, fake.last_name, unique_fields)
+                row.append(last_name)
             elif field_type == "text":
                 length = config.get("length", 200)
-                value = faker.text(max_nb_chars=length)
-                value = ensure_unique(field, value, lambda: faker.text(max_nb_chars=length), unique_fields)
-                item[field] = value
+                value = fake.text(max_nb_chars=length)
+                value = ensure_unique(field, value, lambda: fake.text(max_nb_chars=length), unique_fields)
+                row.append(value)
             elif field_type == "username":
-                value = faker.user_name()
-                value = ensure_unique(field, value, faker.user_name, unique_fields)
-                item[field] = value
+                value = fake.user_name()
+                value = ensure_unique(field, value, fake.user_name, unique_fields)
+                row.append(value)
             elif field_type == "password":
                 length = config.get("length", 12)
-                value = faker.password(length=length)
-                value = ensure_unique(field, value, lambda: faker.password(length=length), unique_fields)
-                item[field] = value
+                value = fake.password(length=length)
+                value = ensure_unique(field, value, lambda: fake.password(length=length), unique_fields)
+                row.append(value)
             elif field_type == "city":
-                value = faker.city()
-                value = ensure_unique(field, value, faker.city, unique_fields)
-                item[field] = value
+                value = fake.city()
+                value = ensure_unique(field, value, fake.city, unique_fields)
+                row.append(value)
             elif field_type == "country":
-                value = faker.country()
-                value = ensure_unique(field, value, faker.country, unique_fields)
-                item[field] = value
+                value = fake.country()
+                value = ensure_unique(field, value, fake.country, unique_fields)
+                row.append(value)
             elif field_type == "zipcode":
-                value = faker.postcode()
-                value = ensure_unique(field, value, faker.postcode, unique_fields)
-                item[field] = value
+                value = fake.postcode()
+                value = ensure_unique(field, value, fake.postcode, unique_fields)
+                row.append(value)
             elif field_type == "address":
-                value = faker.address()
-                value = ensure_unique(field, value, faker.address, unique_fields)
-                item[field] = value
+                value = fake.address()
+                value = ensure_unique(field, value, fake.address, unique_fields)
+                row.append(value)
             elif field_type == "phone":
-                value = faker.phone_number()
-                value = ensure_unique(field, value, faker.phone_number, unique_fields)
-                item[field] = value
+                value = fake.phone_number()
+                value = ensure_unique(field, value, fake.phone_number, unique_fields)
+                row.append(value)
             elif field_type == "url":
-                value = faker.url()
-                value = ensure_unique(field, value, faker.url, unique_fields)
-                item[field] = value
+                value = fake.url()
+                value = ensure_unique(field, value, fake.url, unique_fields)
+                row.append(value)
             elif field_type == "ip":
-                value = faker.ipv4()
-                value = ensure_unique(field, value, faker.ipv4, unique_fields)
-                item[field] = value
-            elif field_type == "price":
-                value = round(random.uniform(1.0, 1000.0), 2)
-                value = ensure_unique(field, value, lambda: round(random.uniform(1.0, 1000.0), 2), unique_fields)
-                item[field] = value
+                value = fake.ipv4()
+                value = ensure_unique(field, value, fake.ipv4, unique_fields)
+                row.append(value)
             elif field_type == "credit_card":
-                value = faker.credit_card_number()
-                value = ensure_unique(field, value, faker.credit_card_number, unique_fields)
-                item[field] = value
+                value = fake.credit_card_number()
+                value = ensure_unique(field, value, fake.credit_card_number, unique_fields)
+                row.append(value)
+            elif field_type == "derived":
+                row.append(None)
             else:
-                item[field] = f"Unsupported type: {field_type}"
+                row.append(f"Unsupported type: {field_type}")
+
+        results.append(row if derived_fields else tuple(row))
 
-        results.append(item)
+    # Derived columns are evaluated column-wise once every source column exists
+    if derived_fields:
+        positions = {field: index for index, field in enumerate(schema)}
+        field_types = {field: config.get("type", "string") for field, config in schema.items()}
+        columns = {
+            field: [row[positions[field]] for row in results]
+            for field in schema if field not in derived_fields
+        }
+        for field in derived_fields:
+            column = derive_column(field, schema[field], columns, field_types)
+            columns[field] = column
+            index = positions[field]
+            for row, value in zip(results, column):
+                row[index] = value
+        results = [tuple(row) for row in results]
 
     return results
@@ -0,0 +1,129 @@
+"""datagen: bulk generation from the command line, without the HTTP layer.
+
+Takes a schema file in the same shape as the /generate request body (an entry
+from /example, with its "schema" wrapper, works too) and writes any supported
+format to stdout or a file. Throughput and memory stats go to stderr, so the
+command doubles as a profiling tool.
+
+Usage:
+    python datagen.py schema.json --count 1000000 --format csv -o orders.csv --workers 4
+    python datagen.py schema.json --count 100 --seed 7 | head
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from exporter import DEFAULT_BATCH_SIZE, export_dataset, iter_export
+from format_utils import STREAMABLE_FORMATS
+
+
+def load_schema(path):
+    """Read a schema file and return (schema, count, format) from it"""
+    with open(path, encoding="utf-8") as f:
+        body = json.load(f)
+    if not isinstance(body, dict):
+        raise ValueError("Schema file must contain a JSON object")
+
+    # /example entries wrap the request body: {"description": ..., "schema": {...}}
+    wrapped = body.get("schema")
+    if isinstance(wrapped, dict) and "type" not in wrapped:
+        body = wrapped
+
+    schema = {k: v for k, v in body.items() if k not in ["count", "format"]}
+    if not schema:
+        raise ValueError("No schema fields provided")
+    return schema, body.get("count", 10), body.get("format", "json")
+
+
+def peak_memory_mb():
+    """Peak resident set size of this process and of its largest worker, in MB"""
+    if resource is None:
+        return None
+    unit = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KB elsewhere
+
+    def to_mb(who):
+        return resource.getrusage(who).ru_maxrss * unit / (1024 * 1024)
+
+    return to_mb(resource.RUSAGE_SELF), to_mb(resource.RUSAGE_CHILDREN)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="datagen", description="Generate fake data from a DataGen schema file")
+    parser.add_argument("schema", help="JSON schema file (same shape as the /generate request body)")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("--count", type=int, help="Number of rows (default: count from the schema file, else 10)")
+    parser.add_argument("--format", dest="fmt", choices=STREAMABLE_FORMATS,
+                        help="Output format (default: format from the schema file, else json)")
+    parser.add_argument("--seed", help="Seed for reproducible output")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes (default: 1). With more than one, unique fields are "
+                             "only unique within each batch of --batch-size rows")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Rows per batch (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--quiet", action="store_true", help="Don't print stats to stderr")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        schema, file_count, file_format = load_schema(args.schema)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    count = args.count if args.count is not None else file_count
+    fmt = args.fmt or file_format
+    if args.workers <= 0:
+        parser.error("--workers must be a positive integer")
+    unique = [field for field, config in schema.items() if isinstance(config, dict) and config.get("unique")]
+    if unique and args.workers > 1:
+        print(f"datagen: warning: with --workers > 1, {', '.join(unique)} are only unique "
+              f"within each batch of {args.batch_size} rows", file=sys.stderr)
+
+    started = time.perf_counter()
+    try:
+        if args.output:
+            stats = export_dataset(schema, count, args.output, fmt, workers=args.workers,
+                                   batch_size=args.batch_size, seed=args.seed)
+            written = stats["bytes"]
+        else:
+            written = 0
+            out = sys.stdout.buffer
+            for chunk in iter_export(schema, count, fmt, workers=args.workers,
+                                     batch_size=args.batch_size, seed=args.seed):
+                data = chunk.encode("utf-8")
+                out.write(data)
+                written += len(data)
+            out.flush()
+    except ValueError as e:
+        parser.error(str(e))
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head); not an error for a CLI
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    elapsed = time.perf_counter() - started
+
+    if not args.quiet:
+        rate = count / elapsed if elapsed else float("inf")
+        mb = written / (1024 * 1024)
+        stats_line = (f"datagen: {count} rows, {mb:.1f} MB in {elapsed:.2f}s "
+                      f"({rate:,.0f} rows/s, {mb / elapsed if elapsed else 0:.1f} MB/s)")
+        peak = peak_memory_mb()
+        if peak is not None:
+            stats_line += f", peak RSS {peak[0]:.1f} MB"
+            if args.workers > 1:
+                stats_line += f" (largest worker {peak[1]:.1f} MB)"
+        print(stats_line, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Cursor-based retrieval of large generated datasets.
+
+A dataset id is not a hash: it is the whole normalized spec (fields in order,
+count and seed), compressed and packed into a URL-safe token, so any page can be
+rebuilt without server-side state. Its length grows with the schema and is
+capped at MAX_DATASET_ID_LENGTH to stay within common URL limits. Rows are
+generated in fixed blocks seeded per block index, the same scheme exporter.py
+uses for batches, so a page only generates the blocks overlapping its row range:
+O(limit + DATASET_BLOCK_SIZE) work however deep the offset is.
+"""
+import base64
+import binascii
+import json
+import secrets
+import zlib
+
+from data_generator import generate_mock_data
+from exporter import batch_seed
+
+DATASET_BLOCK_SIZE = 1000
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+# Well under gunicorn's 4094-byte request line and the ~2 KB some proxies allow
+MAX_DATASET_ID_LENGTH = 1800
+
+
+def _check_fields(fields):
+    for name, config in fields:
+        if not isinstance(config, dict):
+            raise ValueError(f"Field '{name}' must be an object")
+        if config.get("unique"):
+            # Blocks are generated independently, so uniqueness couldn't span pages
+            raise ValueError(f"Field '{name}': unique is not supported for paginated datasets")
+
+
+def normalize_spec(schema: dict, count: int, seed=None) -> dict:
+    """Canonical spec: field order kept, parameters within a field sorted"""
+    if seed is None:
+        seed = secrets.randbelow(2 ** 32)
+    if not isinstance(seed, (int, str)) or isinstance(seed, bool):
+        raise ValueError("Seed must be an integer or string")
+    _check_fields(schema.items())
+    fields = [[name, {k: config[k] for k in sorted(config) if k != "field_name"}]
+              for name, config in schema.items()]
+    return {"count": count, "seed": seed, "fields": fields}
+
+
+def encode_spec(spec: dict) -> str:
+    payload = json.dumps(spec, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(zlib.compress(payload, 9)).decode("ascii").rstrip("=")
+
+
+def decode_spec(spec_id: str) -> dict:
+    """Inverse of encode_spec; raises ValueError for anything that isn't a valid id"""
+    try:
+        padded = spec_id + "=" * (-len(spec_id) % 4)
+        spec = json.loads(zlib.decompress(base64.urlsafe_b64decode(padded)).decode("utf-8"))
+        count, fields = spec["count"], spec["fields"]
+        seed = spec["seed"]
+    except (binascii.Error, zlib.error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid dataset id") from None
+    if not isinstance(count, int) or count <= 0 or not isinstance(fields, list) or not fields:
+        raise ValueError("Invalid dataset id")
+    if not all(isinstance(field, list) and len(field) == 2 for field in fields):
+        raise ValueError("Invalid dataset id")
+    _check_fields(fields)
+    return {"count": count, "seed": seed, "fields": fields}
+
+
+def spec_schema(spec: dict) -> dict:
+    # Fresh dicts each time: generate_mock_data annotates field configs in place
+    return {name: dict(config) for name, config in spec["fields"]}
+
+
+def generate_page(spec: dict, offset: int, limit: int) -> list:
+    """Rows [offset, offset + limit) of the dataset, generating only the blocks they fall in"""
+    total = spec["count"]
+    end = min(offset + limit, total)
+    rows = []
+    if offset >= end:
+        return rows
+
+    for block in range(offset // DATASET_BLOCK_SIZE, (end - 1) // DATASET_BLOCK_SIZE + 1):
+        start = block * DATASET_BLOCK_SIZE
+        size = min(DATASET_BLOCK_SIZE, total - start)
+        data = generate_mock_data(spec_schema(spec), size, seed=batch_seed(spec["seed"], block))
+        rows.extend(data[max(offset - start, 0):end - start])
+    return rows
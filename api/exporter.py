@@ -0,0 +1,194 @@
+"""Server-side export of very large datasets straight to disk.
+
+Batches are generated and rendered by worker processes, and each worker writes
+its own batch into its own byte region of the output file with pwrite, so the
+payload never passes through the parent process or the WSGI layer and every
+byte hits the disk once. A batch's offset is the sum of the sizes of the batches
+before it, which workers publish to each other as soon as they have rendered;
+the export therefore needs free disk space equal to the output size only.
+The file is built under a temporary name in the same directory and only
+renamed to its final path once complete, so a failed export never leaves a
+partial file where it could be served.
+Finished files are served by GET /exports/<filename> with sendfile and Range support.
+
+The command-line front end is datagen.py.
+"""
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from data_generator import generate_mock_rows, seed_generators
+from format_utils import STREAMABLE_FORMATS, format_header, format_rows, format_footer
+
+DEFAULT_BATCH_SIZE = 10000
+
+# Sentinels in the shared offsets table
+_PENDING = -1
+_FAILED = -2
+
+# Set per process by _init_offsets
+_offsets = None
+_offsets_ready = None
+
+
+def batch_bounds(count, batch_size):
+    """Split count rows into (index, rows) batches"""
+    return [(index, min(batch_size, count - start))
+            for index, start in enumerate(range(0, count, batch_size))]
+
+
+def batch_seed(seed, index):
+    """Per-batch seed so worker processes never replay each other's random stream"""
+    return None if seed is None else f"{seed}:{index}"
+
+
+def _render_batch(task):
+    schema, fmt, columns, index, rows, seed, unique_state = task
+    if seed is None:
+        # Forked workers inherit the parent's random state; give each batch fresh entropy
+        seed_generators()
+    _, data = generate_mock_rows(schema, rows, seed=batch_seed(seed, index), unique_state=unique_state)
+    return format_rows(fmt, data, columns, first=index == 0)
+
+
+def _init_offsets(offsets, ready):
+    global _offsets, _offsets_ready
+    _offsets, _offsets_ready = offsets, ready
+
+
+def _write_batch(task):
+    """Render one batch and pwrite it at its offset.
+
+    offsets[i] is the start of batch i; each batch publishes offsets[i + 1]
+    right after rendering, before its own write. Batches are picked up in
+    order, so every batch a worker waits on is already running.
+    """
+    *batch_task, output_path = task
+    index = batch_task[3]
+    try:
+        payload = _render_batch(batch_task).encode("utf-8")
+        with _offsets_ready:
+            _offsets_ready.wait_for(lambda: _offsets[index] != _PENDING)
+            offset = _offsets[index]
+            if offset == _FAILED:
+                raise RuntimeError(f"Export aborted before batch {index}")
+            _offsets[index + 1] = offset + len(payload)
+            _offsets_ready.notify_all()
+    except BaseException:
+        with _offsets_ready:
+            _offsets[index + 1] = _FAILED
+            _offsets_ready.notify_all()
+        raise
+
+    fd = os.open(output_path, os.O_WRONLY)
+    try:
+        view = memoryview(payload)
+        written = 0
+        while written < len(view):
+            written += os.pwrite(fd, view[written:], offset + written)
+    finally:
+        os.close(fd)
+    return len(payload)
+
+
+def _check_args(count, fmt, batch_size):
+    fmt = str(fmt).lower()
+    if fmt not in STREAMABLE_FORMATS:
+        raise ValueError(f"Unsupported format: {fmt}")
+    if not isinstance(count, int) or count <= 0:
+        raise ValueError("Count must be a positive integer")
+    if batch_size <= 0:
+        raise ValueError("Batch size must be a positive integer")
+    return fmt
+
+
+def iter_export(schema: dict, count: int, fmt: str = "csv", workers: int = 1,
+                batch_size: int = DEFAULT_BATCH_SIZE, seed=None):
+    """Yield the rendered document chunk by chunk, in order.
+
+    Produces the same bytes as export_dataset for the same seed, batch size and
+    worker count; used where the output is a stream rather than a seekable file.
+    """
+    fmt = _check_args(count, fmt, batch_size)
+    columns = list(schema.keys())
+    unique_state = {} if not workers or workers <= 1 else None
+    tasks = [(schema, fmt, columns, index, rows, seed, unique_state)
+             for index, rows in batch_bounds(count, batch_size)]
+
+    yield format_header(fmt, columns)
+    if workers and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Keep a bounded window of batches in flight so a slow reader doesn't
+            # make every rendered batch pile up in memory
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.submit(_render_batch, task))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    else:
+        yield from map(_render_batch, tasks)
+    yield format_footer(fmt)
+
+
+def export_dataset(schema: dict, count: int, output_path: str, fmt: str = "csv",
+                   workers: int = None, batch_size: int = DEFAULT_BATCH_SIZE, seed=None) -> dict:
+    """Generate count rows into output_path and return export stats.
+
+    With one worker, unique fields are unique across the whole file. With
+    several, workers don't share state and uniqueness holds within a batch.
+    """
+    fmt = _check_args(count, fmt, batch_size)
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    columns = list(schema.keys())
+    header = format_header(fmt, columns).encode("utf-8")
+    footer = format_footer(fmt).encode("utf-8")
+    batches = batch_bounds(count, batch_size)
+
+    output_path = os.path.abspath(output_path)
+    directory, name = os.path.split(output_path)
+    fd, partial_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".part", dir=directory)
+    try:
+        try:
+            os.fchmod(fd, 0o644)
+            os.pwrite(fd, header, 0)
+        finally:
+            os.close(fd)
+
+        offsets = multiprocessing.Array("q", [len(header)] + [_PENDING] * len(batches), lock=False)
+        ready = multiprocessing.Condition()
+        unique_state = {} if workers <= 1 else None
+        tasks = [(schema, fmt, columns, index, rows, seed, unique_state, partial_path) for index, rows in batches]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_offsets,
+                                     initargs=(offsets, ready)) as pool:
+                list(pool.map(_write_batch, tasks))
+        else:
+            _init_offsets(offsets, ready)
+            list(map(_write_batch, tasks))
+
+        total = offsets[len(batches)] + len(footer)
+        fd = os.open(partial_path, os.O_WRONLY)
+        try:
+            os.pwrite(fd, footer, total - len(footer))
+            os.ftruncate(fd, total)
+        finally:
+            os.close(fd)
+        os.replace(partial_path, output_path)
+    except BaseException:
+        os.unlink(partial_path)
+        raise
+
+    return {
+        "path": output_path,
+        "rows": count,
+        "bytes": total,
+        "batches": len(batches),
+        "workers": workers,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
@@ -1,19 +1,36 @@
 import csv
 import io
+import json
 import xml.etree.ElementTree as ET
+from html import escape
 from xml.dom import minidom
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def table_columns(data: List[Dict]) -> List[str]:
+    """Column order for dict rows: every key, in first-seen order"""
+    return list(dict.fromkeys(key for item in data for key in item))
+
+
+def as_rows(data: List[Dict], columns: List[str]) -> List[Tuple]:
+    """Dict rows as tuples in column order; missing keys become empty cells"""
+    return [tuple(item.get(column, "") for column in columns) for item in data]
+
+
+def convert_rows_to_csv(columns: Sequence[str], rows: Iterable[Sequence]) -> str:
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(columns)
+    writer.writerows(rows)
+    return output.getvalue()
 
 
 def convert_to_csv(data: List[Dict]) -> str:
     if not data:
         return ""
 
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=data[0].keys())
-    writer.writeheader()
-    writer.writerows(data)
-    return output.getvalue()
+    columns = table_columns(data)
+    return convert_rows_to_csv(columns, as_rows(data, columns))
 
 
 def convert_to_xml(data: List[Dict]) -> str:
@@ -37,49 +54,159 @@ def convert_to_sql(data: List[Dict], table_name: str = "generated_data") -> str:
         return ""
 
     columns = list(data[0].keys())
-    sql_statements = []
-
-    for item in data:
-        values = []
-        for column in columns:
-            value = item[column]
-            if isinstance(value, str):
-                escaped_value = str(value).replace("'", "''")
-                value = f"'{escaped_value}'"
-            else:
-                value = str(value)
-            values.append(value)
-
-        sql_statements.append(
-            f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join(values)});"
-        )
-
-    return "\n".join(sql_statements)
-
-
-def convert_to_html(data: List[Dict]) -> str:
+    return "\n".join(_sql_insert([item[column] for column in columns], columns, table_name) for item in data)
+
+
+def _sql_insert(row: Sequence, columns: Sequence[str], table_name: str) -> str:
+    values = []
+    for value in row:
+        if isinstance(value, str):
+            escaped_value = str(value).replace("'", "''")
+            value = f"'{escaped_value}'"
+        else:
+            value = str(value)
+        values.append(value)
+
+    return f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join(values)});"
+
+
+# Cell types whose str() can never contain markup
+_HTML_PLAIN_TYPES = frozenset((int, float, bool, type(None)))
+
+
+def _html_cell(value) -> str:
+    if type(value) is str:
+        return escape(value)
+    return str(value) if type(value) in _HTML_PLAIN_TYPES else escape(str(value))
+
+
+def _html_row(row: Sequence) -> str:
+    cells = [escape(v) if type(v) is str else str(v) if type(v) in _HTML_PLAIN_TYPES else escape(str(v)) for v in row]
+    return "<tr>\n<td>" + "</td>\n<td>".join(cells) + "</td>\n</tr>"
+
+
+# Shows one <tbody data-page> at a time; only emitted in paginated mode
+_HTML_PAGER = """<div class='pager'>
+<button type='button' data-step='-1'>Previous</button>
+<span class='pager-status'></span>
+<button type='button' data-step='1'>Next</button>
+</div>
+<script>
+(function () {
+  var pages = document.querySelectorAll("tbody[data-page]");
+  var status = document.querySelector(".pager-status");
+  var current = 0;
+  function show(index) {
+    current = Math.max(0, Math.min(pages.length - 1, index));
+    for (var i = 0; i < pages.length; i++) pages[i].hidden = i !== current;
+    status.textContent = "Page " + (current + 1) + " of " + pages.length;
+  }
+  document.querySelectorAll(".pager button").forEach(function (button) {
+    button.addEventListener("click", function () { show(current + Number(button.dataset.step)); });
+  });
+  show(0);
+})();
+</script>"""
+
+
+def convert_rows_to_html(columns: Sequence[str], rows: Sequence[Sequence], page_size: Optional[int] = None) -> str:
+    """HTML table with escaped cells.
+
+    With page_size, rows are split into one <tbody> per page and a small pager
+    shows one page at a time, so large tables stay responsive in the browser.
+    """
+    parts = ["<html>", "<body>", "<table border='1'>", "<thead>", "<tr>"]
+    parts.extend(f"<th>{_html_cell(column)}</th>" for column in columns)
+    parts.append("</tr>")
+    parts.append("</thead>")
+
+    if page_size:
+        for page, start in enumerate(range(0, len(rows), page_size)):
+            parts.append(f"<tbody data-page='{page}'>" if page == 0 else f"<tbody data-page='{page}' hidden>")
+            parts.extend(map(_html_row, rows[start:start + page_size]))
+            parts.append("</tbody>")
+    else:
+        parts.append("<tbody>")
+        parts.extend(map(_html_row, rows))
+        parts.append("</tbody>")
+
+    parts.append("</table>")
+    if page_size and len(rows) > page_size:
+        parts.append(_HTML_PAGER)
+    parts.append("</body>")
+    parts.append("</html>")
+
+    return "\n".join(parts)
+
+
+def convert_to_html(data: List[Dict], page_size: Optional[int] = None) -> str:
     if not data:
         return "<html><body><table></table></body></html>"
 
-    html = ["<html>", "<body>", "<table border='1'>", "<thead>", "<tr>"]
+    columns = table_columns(data)
+    return convert_rows_to_html(columns, as_rows(data, columns), page_size)
 
-    for key in data[0].keys():
-        html.append(f"<th>{key}</th>")
-    html.append("</tr>")
-    html.append("</thead>")
-    html.append("<tbody>")
 
-    for item in data:
-        html.append("<tr>")
-        for value in item.values():
-            html.append(f"<td>{value}</td>")
-        html.append("</tr>")
+# Fragment writers: a document is format_header + format_rows(batch)... + format_footer,
+# so large exports can be rendered batch by batch with a fixed column order.
+STREAMABLE_FORMATS = ("json", "csv", "xml", "sql", "html")
+
+_HTML_HEADER = "<html>\n<body>\n<table border='1'>\n<thead>\n<tr>\n"
+_HTML_FOOTER = "</tbody>\n</table>\n</body>\n</html>\n"
 
-    html.append("</tbody>")
-    html.append("</table>")
-    html.append("</body>")
-    html.append("</html>")
 
-    return "\n".join(html)
+def format_header(fmt: str, columns: Sequence[str]) -> str:
+    if fmt == "json":
+        return "[\n"
+    if fmt == "csv":
+        output = io.StringIO()
+        csv.writer(output).writerow(columns)
+        return output.getvalue()
+    if fmt == "xml":
+        return '<?xml version="1.0" ?>\n<data>\n'
+    if fmt == "sql":
+        return ""
+    if fmt == "html":
+        cells = "".join(f"<th>{_html_cell(column)}</th>\n" for column in columns)
+        return f"{_HTML_HEADER}{cells}</tr>\n</thead>\n<tbody>\n"
+    raise ValueError(f"Unsupported format: {fmt}")
 
 
+def format_rows(fmt: str, rows: Sequence[Sequence], columns: Sequence[str], first: bool = False,
+                table_name: str = "generated_data") -> str:
+    """Render tuple rows (in column order) as a document fragment"""
+    if not rows:
+        return ""
+    if fmt == "json":
+        body = ",\n".join(json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str) for row in rows)
+        return body if first else ",\n" + body
+    if fmt == "csv":
+        output = io.StringIO()
+        csv.writer(output).writerows(rows)
+        return output.getvalue()
+    if fmt == "xml":
+        parts = []
+        for row in rows:
+            record = ET.Element("record")
+            for column, value in zip(columns, row):
+                ET.SubElement(record, column).text = str(value)
+            ET.indent(record, space="  ", level=1)
+            parts.append("  " + ET.tostring(record, "unicode") + "\n")
+        return "".join(parts)
+    if fmt == "sql":
+        return "".join(_sql_insert(row, columns, table_name) + "\n" for row in rows)
+    if fmt == "html":
+        return "".join(_html_row(row) + "\n" for row in rows)
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def format_footer(fmt: str) -> str:
+    if fmt == "json":
+        return "\n]\n"
+    if fmt == "xml":
+        return "</data>\n"
+    if fmt == "html":
+        return _HTML_FOOTER
+    if fmt in ("csv", "sql"):
+        return ""
+    raise ValueError(f"Unsupported format: {fmt}")
@@ -1,7 +1,11 @@
-from flask import Flask, request, jsonify, Response, make_response
+from flask import Flask, request, jsonify, Response, make_response, send_from_directory
 from werkzeug.exceptions import HTTPException
-from data_generator import generate_mock_data
-from format_utils import convert_to_csv, convert_to_xml, convert_to_sql, convert_to_html
+from data_generator import generate_mock_data, generate_mock_rows
+from datasets import (DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT, MAX_DATASET_ID_LENGTH, normalize_spec,
+                      encode_spec, decode_spec, spec_schema, generate_page)
+from format_utils import (convert_to_csv, convert_to_xml, convert_to_sql, convert_to_html,
+                          convert_rows_to_csv, convert_rows_to_html)
+import hashlib
 import os
 
 def create_app():
@@ -14,6 +18,9 @@ def create_app():
     # Request limits (16 MB)
     app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024
 
+    # Directory holding finished server-side exports (written by exporter.py)
+    app.config["EXPORT_DIR"] = os.path.abspath(os.getenv("EXPORT_DIR", "exports"))
+
     # Security headers on every response
     @app.after_request
     def set_security_headers(resp):
@@ -24,14 +31,14 @@ def create_app():
         allow_origin = os.getenv("CORS_ALLOW_ORIGIN", "*")
         resp.headers.setdefault("Access-Control-Allow-Origin", allow_origin)
         resp.headers.setdefault("Access-Control-Allow-Methods", "GET,POST")
-        resp.headers.setdefault("Access-Control-Allow-Headers", "Content-Type")
+        resp.headers.setdefault("Access-Control-Allow-Headers", "Content-Type, Range")
         return resp
 
     @app.route("/", methods=["GET"])
     def home():
         return jsonify({
             "message": "Welcome to DataGen API",
-            "endpoints": ["/healthz", "/readyz", "/info", "/example", "/generate"]
+            "endpoints": ["/healthz", "/readyz", "/info", "/example", "/generate", "/datasets", "/exports/<filename>"]
         })
 
     # Liveness: tells if the app process is up and running
@@ -85,10 +92,10 @@ def create_app():
         return jsonify({
             "supported_data_types": {
                 "string": {"description": "Random string value", "parameters": {"pattern": "Regex pattern for custom string generation (optional)", "unique": "Boolean to ensure unique values (optional)"}},
-                "int": {"description": "Random integer value", "parameters": {"min": "Minimum value (default: 0)", "max": "Maximum value (default: 100)", "unique": "Boolean to ensure unique values (optional)"}},
-                "float": {"description": "Random float value", "parameters": {"min": "Minimum value (default: 0)", "max": "Maximum value (default: 100)", "unique": "Boolean to ensure unique values (optional)"}},
+                "int": {"description": "Random integer value", "parameters": {"min": "Minimum value (default: 0)", "max": "Maximum value (default: 100)", "distribution": "uniform, normal, exponential, zipf or poisson (default: uniform)", "mean": "Mean for normal/exponential/poisson (default: midpoint)", "std": "Standard deviation for normal (default: range / 6)", "exponent": "Exponent for zipf (default: 1.1)", "unique": "Boolean to ensure unique values (optional)"}},
+                "float": {"description": "Random float value", "parameters": {"min": "Minimum value (default: 0)", "max": "Maximum value (default: 100)", "distribution": "uniform, normal or exponential (default: uniform)", "mean": "Mean for normal/exponential (default: midpoint)", "std": "Standard deviation for normal (default: range / 6)", "unique": "Boolean to ensure unique values (optional)"}},
                 "bool": {"description": "Random boolean value", "parameters": {"unique": "Boolean to ensure unique values (optional)"}},
-                "date": {"description": "Random date value", "parameters": {"unique": "Boolean to ensure unique values (optional)"}},
+                "date": {"description": "Random date value (YYYY-MM-DD)", "parameters": {"start": "Earliest date (default: 1970-01-01)", "end": "Latest date (default: today)", "unique": "Boolean to ensure unique values (optional)"}},
                 "uuid": {"description": "Random UUID value", "parameters": {"unique": "Boolean to ensure unique values (optional)"}},
                 "email": {"description": "Random email address", "parameters": {"unique": "Boolean to ensure unique values (optional)"}},
                 "name": {"description": "Random full name (first + last)", "parameters": {"unique": "Boolean to ensure unique values (optional)"}},
@@ -104,8 +111,10 @@ def create_app():
                 "phone": {"description": "Random phone number", "parameters": {"unique": "Boolean to ensure unique values (optional)"}},
                 "url": {"description": "Random URL", "parameters": {"unique": "Boolean to ensure unique values (optional)"}},
                 "ip": {"description": "Random IPv4 address", "parameters": {"unique": "Boolean to ensure unique values (optional)"}},
-                "price": {"description": "Random price value (1.0 to 1000.0)", "parameters": {"unique": "Boolean to ensure unique values (optional)"}},
-                "credit_card": {"description": "Random credit card number", "parameters": {"unique": "Boolean to ensure unique values (optional)"}}
+                "price": {"description": "Random price value", "parameters": {"min": "Minimum value (default: 1.0)", "max": "Maximum value (default: 1000.0)", "distribution": "uniform, normal or exponential (default: uniform)", "unique": "Boolean to ensure unique values (optional)"}},
+                "credit_card": {"description": "Random credit card number", "parameters": {"unique": "Boolean to ensure unique values (optional)"}},
+                "enum": {"description": "Random choice from a fixed list", "parameters": {"values": "List of allowed values (required)", "weights": "Relative weight per value (optional)", "unique": "Boolean to ensure unique values (optional)"}},
+                "derived": {"description": "Value computed from other fields", "parameters": {"expression": "Arithmetic over other field names, e.g. 'order_total * 0.08' (required)", "round": "Number of decimal places (optional)"}}
             },
             "global_parameters": {"count": "Number of records to generate (default: 10, max: 10000)", "format": "Output format (default: json)"},
             "supported_output_formats": ["json", "csv", "xml", "sql", "html"],
@@ -161,25 +170,25 @@ def create_app():
                                               "zipcode": {"type": "zipcode"},
                                               "country": {"type": "country"},
                                               "order_total": {"type": "float", "min": 10.0, "max": 2000.0},
-                                              "tax_amount": {"type": "float", "min": 0.0, "max": 200.0},
+                                              "tax_amount": {"type": "derived", "expression": "order_total * 0.08", "round": 2},
                                               "shipping_cost": {"type": "float", "min": 0.0, "max": 50.0},
                                               "order_date": {"type": "date"},
                                               "estimated_delivery": {"type": "date"},
-                                              "order_status": {"type": "string", "pattern": "(Pending|Processing|Shipped|Delivered|Cancelled)"},
+                                              "order_status": {"type": "enum", "values": ["Pending", "Processing", "Shipped", "Delivered", "Cancelled"], "weights": [10, 15, 25, 45, 5]},
                                               "tracking_number": {"type": "string", "pattern": "[A-Z]{2}[0-9]{9}[A-Z]{2}", "unique": True}}},
                 "system_log": {"description": "System log entries with various data types",
                                "schema": {"count": 200, 
                                           "format": "sql",
                                           "log_id": {"type": "int", "min": 1, "max": 1000000, "unique": True},
                                           "timestamp": {"type": "date"},
-                                          "level": {"type": "string", "pattern": "(INFO|WARNING|ERROR|DEBUG|CRITICAL)"},
+                                          "level": {"type": "enum", "values": ["INFO", "WARNING", "ERROR", "DEBUG", "CRITICAL"], "weights": [70, 15, 8, 6, 1]},
                                           "service": {"type": "string", "pattern": "(web|api|database|auth|payment)"},
-                                          "user_id": {"type": "int", "min": 1, "max": 10000},
+                                          "user_id": {"type": "int", "min": 1, "max": 10000, "distribution": "zipf"},
                                           "ip_address": {"type": "ip"},
                                           "user_agent": {"type": "string", "pattern": "Mozilla/[0-9.]+ \\([^)]+\\) [A-Za-z]+/[0-9.]+"},
                                           "request_url": {"type": "url"},
                                           "response_code": {"type": "int", "min": 200, "max": 599},
-                                          "response_time": {"type": "float", "min": 0.01, "max": 10.0},
+                                          "response_time": {"type": "float", "min": 0.01, "max": 10.0, "distribution": "normal", "mean": 0.35, "std": 0.2},
                                           "message": {"type": "text", "length": 200},
                                           "session_id": {"type": "uuid"},
                                           "is_error": {"type": "bool"}}},
@@ -220,16 +229,34 @@ def create_app():
             if not isinstance(schema, dict):
                 return jsonify({"error": "Schema must be an object/dict"}), 400
 
+            fmt = str(out_format).lower()
+            # Tabular formats are written straight from tuple rows, no per-row dicts
+            if fmt == "csv":
+                columns, rows = generate_mock_rows(schema, count)
+                csv_data = convert_rows_to_csv(columns, rows)
+                return Response(csv_data, mimetype='text/csv',
+                                headers={'Content-Disposition': 'attachment; filename=generated_data.csv'})
+            elif fmt == "html":
+                # Presentation option, so it goes in the query string: every body key
+                # other than count/format is a field name
+                page_size = request.args.get("page_size")
+                if page_size is not None:
+                    try:
+                        page_size = int(page_size)
+                    except ValueError:
+                        page_size = 0
+                    if page_size <= 0:
+                        return jsonify({"error": "page_size must be a positive integer"}), 400
+                columns, rows = generate_mock_rows(schema, count)
+                html_data = convert_rows_to_html(columns, rows, page_size)
+                return Response(html_data, mimetype='text/html',
+                                headers={'Content-Disposition': 'attachment; filename=generated_data.html'})
+
             data = generate_mock_data(schema, count)
 
-            fmt = str(out_format).lower()
             # Preparing format chosen by user
             if fmt == "json":
                 return jsonify(data), 200
-            elif fmt == "csv":
-                csv_data = convert_to_csv(data)
-                return Response(csv_data, mimetype='text/csv',
-                                headers={'Content-Disposition': 'attachment; filename=generated_data.csv'})
             elif fmt == "xml":
                 xml_data = convert_to_xml(data)
                 return Response(xml_data, mimetype='application/xml',
@@ -238,16 +265,102 @@ def create_app():
                 sql_data = convert_to_sql(data)
                 return Response(sql_data, mimetype='text/plain',
                                 headers={'Content-Disposition': 'attachment; filename=generated_data.sql'})
-            elif fmt == "html":
-                html_data = convert_to_html(data)
-                return Response(html_data, mimetype='text/html',
-                                headers={'Content-Disposition': 'attachment; filename=generated_data.html'})
             else:
                 return jsonify({"error": f"Unsupported format: {out_format}"}), 400
 
+        except ValueError as e:
+            # Schema problems the generator can describe (bad distribution, expression, ...)
+            return jsonify({"error": str(e)}), 400
         except Exception as e:
             return jsonify({"error": "Request failed"}), 400
 
+    # Register a dataset spec for paginated retrieval; nothing is stored server-side
+    @app.route('/datasets', methods=['POST'])
+    def create_dataset():
+        try:
+            body = request.get_json(silent=True)
+            if not body or not isinstance(body, dict):
+                return jsonify({"error": "No JSON data provided"}), 400
+
+            count = body.get("count", 10)
+            if not isinstance(count, int) or isinstance(count, bool) or count <= 0:
+                return jsonify({"error": "Count must be a positive integer"}), 400
+
+            schema = {k: body[k] for k in body.keys() if k not in ["count", "format", "seed"]}
+            if not schema:
+                return jsonify({"error": "No schema fields provided"}), 400
+
+            spec = normalize_spec(schema, count, body.get("seed"))
+            # Fail fast on schemas the generator rejects
+            generate_mock_data(spec_schema(spec), 1, seed=spec["seed"])
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception:
+            return jsonify({"error": "Request failed"}), 400
+
+        spec_id = encode_spec(spec)
+        if len(spec_id) > MAX_DATASET_ID_LENGTH:
+            return jsonify({"error": f"Schema too large for a dataset id: {len(spec_id)} characters "
+                                     f"(max {MAX_DATASET_ID_LENGTH}); use fewer or shorter field definitions"}), 400
+        return jsonify({
+            "id": spec_id,
+            "count": count,
+            "seed": spec["seed"],
+            "first_page": f"/datasets/{spec_id}?offset=0&limit={DEFAULT_PAGE_LIMIT}",
+        }), 201
+
+    # One page of a dataset; a given id and range always yields the same rows
+    @app.route('/datasets/<spec_id>', methods=['GET'])
+    def get_dataset_page(spec_id):
+        try:
+            offset = int(request.args.get("offset", 0))
+            limit = int(request.args.get("limit", DEFAULT_PAGE_LIMIT))
+        except ValueError:
+            return jsonify({"error": "Offset and limit must be integers"}), 400
+        if offset < 0:
+            return jsonify({"error": "Offset must be a non-negative integer"}), 400
+        if not 1 <= limit <= MAX_PAGE_LIMIT:
+            return jsonify({"error": f"Limit must be between 1 and {MAX_PAGE_LIMIT}"}), 400
+
+        try:
+            spec = decode_spec(spec_id)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # The page is immutable, so the ETag is known before generating anything
+        etag = hashlib.sha256(f"{spec_id}:{offset}:{limit}".encode("utf-8")).hexdigest()[:32]
+        if request.if_none_match.contains(etag):
+            resp = Response(status=304)
+        else:
+            try:
+                rows = generate_page(spec, offset, limit)
+            except ValueError as e:
+                # Ids can be built by clients, so the schema may still be invalid
+                return jsonify({"error": str(e)}), 400
+            except Exception:
+                return jsonify({"error": "Request failed"}), 400
+
+            total = spec["count"]
+            next_offset = offset + limit
+            resp = jsonify({
+                "id": spec_id,
+                "offset": offset,
+                "limit": limit,
+                "total": total,
+                "next": f"/datasets/{spec_id}?offset={next_offset}&limit={limit}" if next_offset < total else None,
+                "data": rows,
+            })
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return resp
+
+    # Download a finished export. send_file hands the open file to the server's
+    # wsgi.file_wrapper (sendfile under gunicorn) and answers Range requests.
+    @app.route('/exports/<path:filename>', methods=['GET', 'HEAD'])
+    def download_export(filename):
+        return send_from_directory(app.config["EXPORT_DIR"], filename,
+                                   as_attachment=True, conditional=True)
+
     @app.errorhandler(413)
     def too_large(_e):
         return jsonify({"error": "Payload too large"}), 413
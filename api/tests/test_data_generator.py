@@ -1,3 +1,5 @@
+import pytest
+
 from data_generator import generate_mock_data
 
 
@@ -27,6 +29,22 @@ def test_generate_unique_int_feasible():
     assert len(values) == len(set(values))
 
 
+def test_unique_sampled_columns_keep_valid_values():
+    schema = {"level": {"type": "enum", "values": ["a", "b", "c"], "unique": True}}
+    data = generate_mock_data(schema, count=3, seed=1)
+    assert sorted(row["level"] for row in data) == ["a", "b", "c"]
+    with pytest.raises(ValueError, match="unique values for level"):
+        generate_mock_data(schema, count=4, seed=1)
+
+    schema = {"rank": {"type": "int", "min": 1, "max": 1000, "distribution": "zipf", "unique": True}}
+    values = [row["rank"] for row in generate_mock_data(schema, count=50, seed=1)]
+    assert all(isinstance(v, int) for v in values)
+    assert len(set(values)) == 50
+    schema["rank"]["max"] = 5
+    with pytest.raises(ValueError, match="unique values for rank"):
+        generate_mock_data(schema, count=6, seed=1)
+
+
 def test_generate_pattern_string():
     schema = {"code": {"type": "string", "pattern": "[A-Z]{2}-[0-9]{3}"}}
     data = generate_mock_data(schema, count=3)
@@ -67,3 +85,170 @@ def test_float_range_respected():
         assert 1.5 <= row["rating"] <= 2.5
 
 
+def test_normal_distribution_clamped_to_bounds():
+    schema = {"ms": {"type": "float", "min": 0, "max": 500, "distribution": "normal", "mean": 120, "std": 40}}
+    data = generate_mock_data(schema, count=500)
+    values = [row["ms"] for row in data]
+    assert all(0 <= v <= 500 for v in values)
+    assert 100 <= sum(values) / len(values) <= 140
+
+
+def test_zipf_distribution_skews_to_min():
+    schema = {"user_id": {"type": "int", "min": 1, "max": 1000, "distribution": "zipf", "exponent": 1.5}}
+    data = generate_mock_data(schema, count=1000)
+    values = [row["user_id"] for row in data]
+    assert all(1 <= v <= 1000 for v in values)
+    assert values.count(1) > values.count(2) > 0
+
+
+def test_poisson_distribution_ints_in_range():
+    schema = {"hits": {"type": "int", "min": 0, "max": 50, "distribution": "poisson", "mean": 4}}
+    data = generate_mock_data(schema, count=300)
+    assert all(isinstance(row["hits"], int) and 0 <= row["hits"] <= 50 for row in data)
+
+
+def test_wide_zipf_and_poisson_ranges_sample_without_tables():
+    import data_generator
+
+    schema = {
+        "rank": {"type": "int", "min": 0, "max": 10000000, "distribution": "zipf", "exponent": 1.5},
+        "hits": {"type": "int", "min": 0, "max": 10000000, "distribution": "poisson", "mean": 5000},
+    }
+    data = generate_mock_data(schema, count=1000)
+    ranks = [row["rank"] for row in data]
+    hits = [row["hits"] for row in data]
+    assert all(0 <= v <= 10000000 for v in ranks + hits)
+    assert ranks.count(0) > ranks.count(1) > 0
+    assert 4900 < sum(hits) / len(hits) < 5100
+    assert all(len(table) < data_generator.WEIGHT_TABLE_LIMIT for table in data_generator._cum_weights_cache.values())
+
+    schema = {"hits": {"type": "int", "min": 1000, "max": 10000000, "distribution": "poisson", "mean": 5}}
+    with pytest.raises(ValueError, match="almost no mass"):
+        generate_mock_data(schema, count=1)
+
+
+def test_weight_table_cache_is_bounded_by_total_size():
+    import data_generator
+
+    for max_val in range(9000, 9000 + 20 * 100, 100):
+        generate_mock_data({"n": {"type": "int", "min": 0, "max": max_val, "distribution": "zipf"}}, count=1)
+    assert data_generator._cum_weights_cached == sum(map(len, data_generator._cum_weights_cache.values()))
+    assert data_generator._cum_weights_cached <= data_generator.CUM_WEIGHTS_CACHE_LIMIT
+
+
+def test_unknown_distribution_rejected():
+    schema = {"n": {"type": "int", "distribution": "cauchy"}}
+    with pytest.raises(ValueError):
+        generate_mock_data(schema, count=1)
+
+
+def test_weighted_enum():
+    schema = {"level": {"type": "enum", "values": ["INFO", "ERROR"], "weights": [1, 0]}}
+    data = generate_mock_data(schema, count=20)
+    assert all(row["level"] == "INFO" for row in data)
+
+
+def test_enum_weights_validated():
+    for weights, message in [
+        (5, "must be a list"),
+        ([1], "must be a list"),
+        ([1, -1], "non-negative numbers"),
+        ([1, "2"], "non-negative numbers"),
+        ([0, 0], "positive sum"),
+    ]:
+        schema = {"level": {"type": "enum", "values": ["INFO", "ERROR"], "weights": weights}}
+        with pytest.raises(ValueError, match=message):
+            generate_mock_data(schema, count=1)
+
+
+def test_date_range_and_price_bounds():
+    schema = {
+        "day": {"type": "date", "start": "2024-02-01", "end": "2024-02-29"},
+        "price": {"type": "price", "min": 5, "max": 6},
+    }
+    data = generate_mock_data(schema, count=50)
+    assert all("2024-02-01" <= row["day"] <= "2024-02-29" for row in data)
+    assert all(5 <= row["price"] <= 6 for row in data)
+
+
+def test_derived_column_keeps_field_order():
+    schema = {
+        "order_total": {"type": "float", "min": 10, "max": 100},
+        "tax_amount": {"type": "derived", "expression": "order_total * 0.2", "round": 2},
+        "status": {"type": "string"},
+    }
+    data = generate_mock_data(schema, count=10)
+    assert list(data[0].keys()) == ["order_total", "tax_amount", "status"]
+    for row in data:
+        assert row["tax_amount"] == round(row["order_total"] * 0.2, 2)
+
+
+def test_derived_expression_rejects_unsafe_syntax():
+    schema = {
+        "n": {"type": "int"},
+        "bad": {"type": "derived", "expression": "n.__class__"},
+    }
+    with pytest.raises(ValueError):
+        generate_mock_data(schema, count=1)
+
+
+def test_derived_expression_rejects_huge_powers():
+    schema = {
+        "n": {"type": "int"},
+        "d": {"type": "derived", "expression": "9**9**9**9"},
+    }
+    with pytest.raises(ValueError):
+        generate_mock_data(schema, count=1)
+
+    schema["d"]["expression"] = "n ** 2"
+    data = generate_mock_data(schema, count=5)
+    assert all(row["d"] == row["n"] ** 2 for row in data)
+
+
+def test_derived_expression_evaluation_errors_name_field():
+    schema = {
+        "n": {"type": "int"},
+        "ratio": {"type": "derived", "expression": "n / 0"},
+    }
+    with pytest.raises(ValueError, match="Cannot evaluate expression for ratio"):
+        generate_mock_data(schema, count=3)
+
+    schema = {
+        "n": {"type": "float", "min": 1e300, "max": 1e300},
+        "square": {"type": "derived", "expression": "n * n"},
+    }
+    with pytest.raises(ValueError, match="Cannot evaluate expression for square"):
+        generate_mock_data(schema, count=3)
+
+
+def test_derived_expression_rejects_non_numeric_fields():
+    schema = {
+        "word": {"type": "string"},
+        "repeated": {"type": "derived", "expression": "word * 10**7"},
+    }
+    with pytest.raises(ValueError, match="word is not numeric"):
+        generate_mock_data(schema, count=5)
+
+
+def test_seeded_run_restores_shared_random_state():
+    import random
+    from data_generator import faker
+
+    random_state, faker_state = random.getstate(), faker.random.getstate()
+    generate_mock_data({"pwd": {"type": "password"}, "n": {"type": "int"}}, count=3, seed=5)
+    assert random.getstate() == random_state
+    assert faker.random.getstate() == faker_state
+
+
+def test_seeded_runs_are_reproducible_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    schema = {
+        "name": {"type": "name"},
+        "code": {"type": "string", "pattern": "[A-Z]{4}"},
+        "n": {"type": "int", "min": 0, "max": 100000, "distribution": "zipf"},
+    }
+    expected = generate_mock_data(schema, count=200, seed="s")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        runs = list(pool.map(lambda seed: generate_mock_data(schema, count=200, seed=seed), ["s", None] * 4))
+    assert all(run == expected for run in runs[::2])
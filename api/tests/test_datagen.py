@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+
+import pytest
+
+from datagen import main
+
+
+SCHEMA = {
+    "count": 4,
+    "format": "json",
+    "id": {"type": "int", "min": 1, "max": 10},
+    "name": {"type": "name"},
+}
+
+
+@pytest.fixture()
+def schema_file(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps(SCHEMA))
+    return path
+
+
+def test_stdout_uses_count_and_format_from_file(schema_file, capsys):
+    assert main([str(schema_file)]) == 0
+    out, err = capsys.readouterr()
+    assert len(json.loads(out)) == 4
+    assert "rows/s" in err
+
+
+def test_options_override_file_and_write_output(schema_file, tmp_path):
+    out = tmp_path / "out.csv"
+    main([str(schema_file), "--count", "25", "--format", "csv", "--batch-size", "10",
+          "--workers", "2", "-o", str(out), "--quiet"])
+    rows = list(csv.reader(io.StringIO(out.read_text())))
+    assert rows[0] == ["id", "name"]
+    assert len(rows) == 26
+
+
+def test_accepts_example_entry_and_seed(tmp_path, capsys):
+    path = tmp_path / "example.json"
+    path.write_text(json.dumps({"description": "Example", "schema": SCHEMA}))
+    main([str(path), "--format", "sql", "--seed", "7", "--quiet"])
+    first = capsys.readouterr().out
+    main([str(path), "--format", "sql", "--seed", "7", "--quiet"])
+    assert capsys.readouterr().out == first
+    assert first.startswith("INSERT INTO generated_data (id, name)")
+
+
+def test_invalid_schema_file_exits(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text(json.dumps({"count": 5}))
+    with pytest.raises(SystemExit):
+        main([str(path)])
+
+
+def test_unique_holds_across_batches_with_one_worker(tmp_path, capsys):
+    path = tmp_path / "unique.json"
+    path.write_text(json.dumps({"id": {"type": "int", "min": 1, "max": 40000, "unique": True},
+                                "email": {"type": "email", "unique": True}}))
+    main([str(path), "--count", "3000", "--batch-size", "500", "--format", "csv", "--quiet"])
+    rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))[1:]
+    assert len({row[0] for row in rows}) == 3000
+    assert len({row[1] for row in rows}) == 3000
+
+
+def test_warns_about_unique_with_several_workers(tmp_path, capsys):
+    path = tmp_path / "unique.json"
+    path.write_text(json.dumps({"id": {"type": "int", "max": 100000, "unique": True}}))
+    main([str(path), "--count", "20", "--workers", "2", "--format", "csv", "--quiet"])
+    assert "only unique within each batch" in capsys.readouterr().err
@@ -0,0 +1,51 @@
+import csv
+import json
+
+import pytest
+
+from exporter import export_dataset
+
+
+SCHEMA = {
+    "id": {"type": "int", "min": 1, "max": 1000},
+    "name": {"type": "name"},
+    "score": {"type": "float", "min": 0, "max": 1},
+}
+
+
+def test_export_csv_with_workers(tmp_path):
+    out = tmp_path / "data.csv"
+    stats = export_dataset(SCHEMA, 250, str(out), "csv", workers=2, batch_size=40)
+    assert stats["batches"] == 7
+    assert stats["bytes"] == out.stat().st_size
+    with open(out, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["id", "name", "score"]
+    assert len(rows) == 251
+    assert not [p for p in tmp_path.iterdir() if p.name != "data.csv"]
+
+
+def test_export_json_is_valid_document(tmp_path):
+    out = tmp_path / "data.json"
+    export_dataset(SCHEMA, 30, str(out), "json", workers=1, batch_size=7)
+    data = json.loads(out.read_text())
+    assert len(data) == 30
+    assert list(data[0].keys()) == ["id", "name", "score"]
+
+
+def test_export_seed_is_reproducible(tmp_path):
+    first, second = tmp_path / "a.sql", tmp_path / "b.sql"
+    export_dataset(SCHEMA, 20, str(first), "sql", workers=2, batch_size=5, seed=42)
+    export_dataset(SCHEMA, 20, str(second), "sql", workers=1, batch_size=5, seed=42)
+    assert first.read_bytes() == second.read_bytes()
+
+
+def test_failed_export_leaves_no_partial_file(tmp_path):
+    out = tmp_path / "data.csv"
+    out.write_text("previous export")
+    schema = dict(SCHEMA, bad={"type": "derived", "expression": "missing * 2"})
+    for workers in (1, 2):
+        with pytest.raises(ValueError):
+            export_dataset(schema, 50, str(out), "csv", workers=workers, batch_size=10)
+        assert [p.name for p in tmp_path.iterdir()] == ["data.csv"]
+        assert out.read_text() == "previous export"
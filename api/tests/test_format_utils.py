@@ -1,4 +1,5 @@
-from format_utils import convert_to_csv, convert_to_xml, convert_to_sql, convert_to_html
+from format_utils import (convert_to_csv, convert_to_xml, convert_to_sql, convert_to_html,
+                          convert_rows_to_csv, convert_rows_to_html)
 
 
 SAMPLE = [
@@ -36,3 +37,31 @@ def test_convert_to_html_basic():
     assert html_text.count("<tr>") >= 3
 
 
+def test_convert_to_csv_aligns_rows_with_differing_keys():
+    data = [{"id": 1, "name": "Alice"}, {"name": "Bob", "city": "Berlin"}]
+    lines = convert_to_csv(data).splitlines()
+    assert lines == ["id,name,city", "1,Alice,", ",Bob,Berlin"]
+
+
+def test_convert_rows_to_csv_quotes_values():
+    csv_text = convert_rows_to_csv(["id", "note"], [(1, 'say "hi", then leave')])
+    assert csv_text.splitlines()[1] == '1,"say ""hi"", then leave"'
+
+
+def test_convert_to_html_escapes_values():
+    html_text = convert_to_html([{"<b>": "<script>alert('x')</script>", "ok": "a & b"}])
+    assert "<script>" not in html_text
+    assert "<th>&lt;b&gt;</th>" in html_text
+    assert "<td>a &amp; b</td>" in html_text
+
+    html_text = convert_rows_to_html(["n", "ok", "tags"], [(3, True, ["<i>"])])
+    assert "<td>3</td>\n<td>True</td>\n<td>[&#x27;&lt;i&gt;&#x27;]</td>" in html_text
+
+
+def test_convert_rows_to_html_paginated():
+    rows = [(i, f"name{i}") for i in range(25)]
+    html_text = convert_rows_to_html(["id", "name"], rows, page_size=10)
+    assert html_text.count("<tbody data-page=") == 3
+    assert html_text.count(" hidden>") == 2
+    assert html_text.count("<tr>") == 26
+    assert "class='pager'" in html_text
@@ -73,3 +73,115 @@ def test_error_when_invalid_count_type(client):
     assert "Count must be a positive integer" in resp.get_json().get("error", "")
 
 
+def test_download_export_supports_range(client, tmp_path, monkeypatch):
+    (tmp_path / "data.csv").write_text("id,name\n1,Alice\n")
+    monkeypatch.setitem(app.config, "EXPORT_DIR", str(tmp_path))
+    resp = client.get("/exports/data.csv", headers={"Range": "bytes=0-6"})
+    assert resp.status_code == 206
+    assert resp.get_data(as_text=True) == "id,name"
+    assert resp.headers["Accept-Ranges"] == "bytes"
+
+    resp = client.get("/exports/missing.csv")
+    assert resp.status_code == 404
+
+
+def _create_dataset(client, **extra):
+    payload = {"count": 2500, "seed": 11, "id": {"type": "int", "min": 1, "max": 10**6}, "name": {"type": "name"}}
+    payload.update(extra)
+    resp = client.post("/datasets", json=payload)
+    assert resp.status_code == 201
+    return resp.get_json()
+
+
+def test_dataset_pages_are_stable_and_cacheable(client):
+    dataset = _create_dataset(client)
+    url = f"/datasets/{dataset['id']}"
+
+    resp = client.get(f"{url}?offset=990&limit=20")
+    assert resp.status_code == 200
+    assert "immutable" in resp.headers["Cache-Control"]
+    page = resp.get_json()
+    assert page["total"] == 2500 and len(page["data"]) == 20
+    assert page["next"].endswith("offset=1010&limit=20")
+
+    # Overlapping pages agree row for row, across block boundaries
+    wide = client.get(f"{url}?offset=980&limit=40").get_json()["data"]
+    assert wide[10:30] == page["data"]
+
+    resp = client.get(f"{url}?offset=990&limit=20", headers={"If-None-Match": resp.headers["ETag"]})
+    assert resp.status_code == 304
+
+
+def test_dataset_id_is_deterministic_and_last_page_short(client):
+    first = _create_dataset(client)
+    assert _create_dataset(client)["id"] == first["id"]
+    page = client.get(f"/datasets/{first['id']}?offset=2490&limit=100").get_json()
+    assert len(page["data"]) == 10 and page["next"] is None
+
+
+def test_dataset_rejects_bad_ids_and_limits(client):
+    assert client.get("/datasets/not-a-dataset").status_code == 400
+    dataset = _create_dataset(client)
+    assert client.get(f"/datasets/{dataset['id']}?limit=5000").status_code == 400
+    assert client.get(f"/datasets/{dataset['id']}?offset=-1").status_code == 400
+
+
+def test_generate_html_paginated(client):
+    payload = {"count": 30, "format": "html", "id": {"type": "int", "min": 1, "max": 10}}
+    resp = client.post("/generate?page_size=10", json=payload)
+    assert resp.status_code == 200
+    assert resp.get_data(as_text=True).count("<tbody data-page=") == 3
+
+    resp = client.post("/generate?page_size=0", json=payload)
+    assert resp.status_code == 400
+
+    resp = client.post("/generate?page_size=abc", json=payload)
+    assert resp.status_code == 400
+
+
+def test_generate_reports_schema_errors(client):
+    payload = {"count": 2, "n": {"type": "int"}, "r": {"type": "derived", "expression": "n / 0"}}
+    resp = client.post("/generate", json=payload)
+    assert resp.status_code == 400
+    assert "Cannot evaluate expression for r" in resp.get_json()["error"]
+
+
+def test_dataset_page_does_not_fix_later_unseeded_output(client):
+    dataset = _create_dataset(client)
+    payload = {"count": 5, "pwd": {"type": "password"}}
+    outputs = []
+    for _ in range(2):
+        client.get(f"/datasets/{dataset['id']}?offset=0&limit=5")
+        outputs.append(client.post("/generate", json=payload).get_json())
+    assert outputs[0] != outputs[1]
+
+
+def test_dataset_rejects_unique_fields(client):
+    payload = {"count": 2000, "id": {"type": "int", "min": 1, "max": 3000, "unique": True}}
+    resp = client.post("/datasets", json=payload)
+    assert resp.status_code == 400
+    assert "unique" in resp.get_json()["error"]
+
+
+def test_dataset_rejects_non_integer_paging_and_oversized_specs(client):
+    dataset = _create_dataset(client)
+    assert client.get(f"/datasets/{dataset['id']}?offset=abc").status_code == 400
+    assert client.get(f"/datasets/{dataset['id']}?limit=abc").status_code == 400
+
+    payload = {"count": 10}
+    payload.update({f"field_{i}": {"type": "enum", "values": [f"v{i}_{j}_{i * j}" for j in range(40)]}
+                    for i in range(40)})
+    resp = client.post("/datasets", json=payload)
+    assert resp.status_code == 400
+    assert "too large" in resp.get_json()["error"]
+
+
+def test_dataset_page_reports_schema_errors(client):
+    from datasets import encode_spec, normalize_spec
+
+    schema = {"level": {"type": "enum", "values": ["a", "b"], "weights": 5}}
+    spec_id = encode_spec(normalize_spec(schema, 10, seed=1))
+    resp = client.get(f"/datasets/{spec_id}")
+    assert resp.status_code == 400
+    assert "weights" in resp.get_json()["error"]
+    assert "Cache-Control" not in resp.headers